@@ -0,0 +1,263 @@
+from paraview.simple import *
+from paraview import servermanager
+from vtkmodules.util.numpy_support import vtk_to_numpy
+import numpy as np
+import lzma
+import os
+import struct
+import zlib
+import tkinter as tk
+from tkinter import simpledialog, messagebox
+
+# The container layout must stay in sync with SciBlend/utils/frame_container.py.
+MAGIC = b"SBF1"
+VERSION = 2
+CODEC_ZLIB = 0
+CODEC_LZMA = 1
+QUANT_LEVELS = 65535
+VTK_COLOR_MODE_MAP_SCALARS = 1
+
+# Fixed little-endian dtype per chunk code; NumPy dtype characters differ between platforms.
+DTYPES = {
+    1: np.dtype("<u1"),
+    2: np.dtype("<u2"),
+    3: np.dtype("<i4"),
+    4: np.dtype("<u4"),
+    5: np.dtype("<f4"),
+}
+DTYPE_CODES = {(dtype.kind, dtype.itemsize): code for code, dtype in DTYPES.items()}
+
+HEADER = struct.Struct("<4sHBBIQ")
+FRAME = struct.Struct("<H")
+CHUNK = struct.Struct("<4sBII")
+INDEX_ENTRY = struct.Struct("<IQI")
+
+
+def quantize(positions):
+    lo = positions.min(axis=0)
+    hi = positions.max(axis=0)
+    extent = hi - lo
+    scale = np.divide(QUANT_LEVELS, extent, out=np.zeros_like(extent), where=extent > 0)
+    quantized = np.rint((positions - lo) * scale).astype(np.uint16)
+    return np.concatenate((lo, hi)).astype(np.float32), np.ascontiguousarray(quantized.T)
+
+
+def dequantize(bounds, planar):
+    lo = bounds[:3]
+    step = (bounds[3:] - lo) / QUANT_LEVELS
+    return (planar.T.astype(np.float32) * step + lo).astype(np.float32)
+
+
+def encode_frame(positions, indices, colors, scalars):
+    bounds, planar = quantize(positions)
+    chunks = {
+        b"BNDS": bounds,
+        b"POSQ": planar,
+        b"IDXD": np.diff(indices.astype(np.int64), prepend=0).astype(np.int32),
+    }
+    if colors is not None:
+        chunks[b"COLR"] = colors.astype(np.uint8)
+    if scalars is not None:
+        chunks[b"SCAL"] = scalars.astype(np.float32)
+    return chunks
+
+
+def topology_matches(key, positions, indices, colors, scalars):
+    return (len(key["positions"]) == len(positions)
+            and (key["colors"] is None) == (colors is None)
+            and (key["scalars"] is None) == (scalars is None)
+            and np.array_equal(key["indices"], indices))
+
+
+def encode_delta(key, positions, colors, scalars):
+    bounds, planar = quantize(positions - key["positions"])
+    chunks = {
+        b"KREF": np.array([key["number"]], dtype=np.uint32),
+        b"DBND": bounds,
+        b"DPOQ": planar,
+    }
+    if colors is not None:
+        chunks[b"DCOL"] = colors.astype(np.uint8) - key["colors"]
+    if scalars is not None:
+        chunks[b"DSCA"] = scalars.astype(np.float32) - key["scalars"]
+    return chunks
+
+
+def pack_frame(chunks, codec):
+    parts = [FRAME.pack(len(chunks))]
+    for tag, array in chunks.items():
+        code = DTYPE_CODES[(array.dtype.kind, array.dtype.itemsize)]
+        raw = np.ascontiguousarray(array, dtype=DTYPES[code]).tobytes()
+        if codec == CODEC_LZMA:
+            stored = lzma.compress(raw)
+        else:
+            stored = zlib.compress(raw, 6)
+        parts.append(CHUNK.pack(tag, code, len(raw), len(stored)))
+        parts.append(stored)
+    return b"".join(parts)
+
+
+def write_frames(file_path, frames, codec, keyframe_interval):
+    """Write ``(number, positions, indices, colors, scalars)`` frames to ``file_path``.
+
+    The index and header are written even if producing a frame fails, so the
+    frames exported up to that point stay readable.
+    """
+    entries = []
+    key = None
+    since_key = 0
+
+    with open(file_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, codec, 0, 0, 0))
+        try:
+            for number, positions, indices, colors, scalars in frames:
+                if (key is not None and since_key < keyframe_interval
+                        and topology_matches(key, positions, indices, colors, scalars)):
+                    chunks = encode_delta(key, positions, colors, scalars)
+                    since_key += 1
+                else:
+                    chunks = encode_frame(positions, indices, colors, scalars)
+                    key = {
+                        "number": number,
+                        "positions": dequantize(chunks[b"BNDS"], chunks[b"POSQ"]),
+                        "indices": indices,
+                        "colors": chunks.get(b"COLR"),
+                        "scalars": chunks.get(b"SCAL"),
+                    }
+                    since_key = 1
+
+                payload = pack_frame(chunks, codec)
+                entries.append((number, f.tell(), len(payload)))
+                f.write(payload)
+
+                print(f"Exported frame {number} to {file_path} successfully.")
+        finally:
+            index_offset = f.tell()
+            for entry in entries:
+                f.write(INDEX_ENTRY.pack(*entry))
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, codec, 0, len(entries), index_offset))
+
+    return len(entries)
+
+
+def build_pipeline(source, display):
+    """Triangulated surface of ``source``; cell coloring is averaged onto the
+    points because the container stores per-vertex colors."""
+    merged = MergeBlocks(Input=source)
+    surface = ExtractSurface(Input=merged)
+    filters = [merged, surface, Triangulate(Input=surface)]
+    association, array_name = display.ColorArrayName
+    if array_name and association == 'CELLS':
+        filters.append(CellDatatoPointData(Input=filters[-1]))
+    return filters
+
+
+def fetch_frame(output, display):
+    data = servermanager.Fetch(output)
+    positions = vtk_to_numpy(data.GetPoints().GetData()).astype(np.float32)
+    indices = vtk_to_numpy(data.GetPolys().GetConnectivityArray())
+
+    colors = None
+    scalars = None
+    association, array_name = display.ColorArrayName
+    if array_name and association in ('POINTS', 'CELLS'):
+        vtk_array = data.GetPointData().GetArray(array_name)
+        if vtk_array is not None:
+            lut = GetColorTransferFunction(array_name).GetClientSideObject()
+            rgba = lut.MapScalars(vtk_array, VTK_COLOR_MODE_MAP_SCALARS, -1)
+            colors = vtk_to_numpy(rgba)[:, :3]
+            values = vtk_to_numpy(vtk_array)
+            scalars = values if values.ndim == 1 else np.linalg.norm(values, axis=1)
+
+    return positions, indices, colors, scalars
+
+
+def merge_frames(parts):
+    """Concatenate per-source frames into one mesh. Sources without coloring
+    are white; scalars are kept only if every source has them."""
+    positions = np.concatenate([p[0] for p in parts])
+    offsets = np.cumsum([0] + [len(p[0]) for p in parts[:-1]])
+    indices = np.concatenate([p[1].astype(np.int64) + offset for p, offset in zip(parts, offsets)])
+
+    colors = None
+    if any(p[2] is not None for p in parts):
+        colors = np.concatenate([p[2] if p[2] is not None else np.full((len(p[0]), 3), 255, np.uint8)
+                                 for p in parts])
+    scalars = None
+    if all(p[3] is not None for p in parts):
+        scalars = np.concatenate([p[3] for p in parts]).astype(np.float32)
+    return positions, indices, colors, scalars
+
+
+root = tk.Tk()
+root.withdraw()
+
+folder_selected = simpledialog.askstring(
+    "Input", "Please enter the full directory path where you want to save the frames (e.g., /home/user/folder):")
+
+if folder_selected and os.path.isdir(folder_selected):
+    num_frames = simpledialog.askinteger(
+        "Input", "Enter the number of frames to export:")
+    codec = CODEC_LZMA if messagebox.askyesno(
+        "Input", "Use LZMA compression (smaller files, slower export) instead of zlib?") else CODEC_ZLIB
+    keyframe_interval = simpledialog.askinteger(
+        "Input", "Store a full keyframe every N frames (1 stores every frame in full):",
+        initialvalue=10, minvalue=1)
+    if keyframe_interval is None:
+        keyframe_interval = 1
+
+    selected_object = GetActiveSource()
+    renderView = GetActiveViewOrCreate('RenderView')
+    visible_sources = []
+    for source in GetSources().values():
+        representation = servermanager.GetRepresentation(source, renderView)
+        if representation is not None and representation.Visibility:
+            visible_sources.append(source)
+    if not visible_sources and selected_object:
+        Show(selected_object, renderView)
+        visible_sources = [selected_object]
+
+    if not num_frames:
+        print("No number of frames entered.")
+    elif visible_sources:
+        animationScene = GetAnimationScene()
+        timeKeeper = GetTimeKeeper()
+        animationScene.UpdateAnimationUsingDataTimeSteps()
+
+        timesteps = timeKeeper.TimestepValues
+        # A single timestep comes back as a bare float and static data has none.
+        timesteps = [timesteps] if isinstance(timesteps, (int, float)) else list(timesteps)
+        timesteps = timesteps or [timeKeeper.Time]
+        if len(timesteps) < num_frames:
+            print(f"Only {len(timesteps)} timesteps are available; exporting {len(timesteps)} frames.")
+            num_frames = len(timesteps)
+
+        pipelines = []
+        for source in visible_sources:
+            display = GetDisplayProperties(source, view=renderView)
+            pipelines.append((build_pipeline(source, display), display))
+
+        def frames():
+            for i in range(num_frames):
+                current_time = timesteps[i]
+                animationScene.TimeKeeper.Time = current_time
+                parts = []
+                for filters, display in pipelines:
+                    filters[-1].UpdatePipeline(current_time)
+                    parts.append(fetch_frame(filters[-1], display))
+                yield (i + 1,) + merge_frames(parts)
+
+        file_path = os.path.join(folder_selected, "frames.sbf")
+        try:
+            write_frames(file_path, frames(), codec, keyframe_interval)
+        finally:
+            for filters, _ in pipelines:
+                for helper in reversed(filters):
+                    Delete(helper)
+            if selected_object:
+                SetActiveSource(selected_object)
+    else:
+        print("No visible object to export.")
+else:
+    print("No valid folder selected.")
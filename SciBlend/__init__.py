@@ -1,17 +1,14 @@
 import bpy
-import os
-import bpy.utils.previews
 
-from .operators.import_operators import ImportStaticX3DOperator, ImportX3DAnimationOperator
+from .operators.import_operators import ImportStaticX3DOperator, ImportX3DAnimationOperator, ImportCompressedAnimationOperator
 from .operators.material_operators import CreateSharedMaterialOperator, ApplySharedMaterialOperator, RemoveAllShadersOperator
+from .utils import sequence_handlers
 from .operators.object_operators import (
     CreateNullOperator, ParentNullToGeoOperator, NullToOriginOperator, CreateSceneOperator,
     BooleanCutterOperator, BooleanCutterHideOperator,
     AddMeshCutterOperator, GroupObjectsOperator, DeleteHierarchyOperator
 )
 
-preview_collection = None
-
 class X3DImportSettings(bpy.types.PropertyGroup):
     scale_factor: bpy.props.FloatProperty(
         name="Scale Factor",
@@ -60,6 +57,59 @@ class X3DImportSettings(bpy.types.PropertyGroup):
         default=100,
         min=1
     )
+    frame_stride: bpy.props.IntProperty(
+        name="Stride",
+        description="Import every Nth file of the frame range",
+        default=1,
+        min=1
+    )
+    target_fps: bpy.props.IntProperty(
+        name="Target FPS",
+        description="Scene frame rate used when a target duration is set",
+        default=24,
+        min=1,
+        max=240
+    )
+    target_duration: bpy.props.FloatProperty(
+        name="Target Duration",
+        description="Stretch the frame range onto this many seconds of animation (0 keeps one scene frame per file)",
+        default=0.0,
+        min=0.0,
+        unit='TIME_ABSOLUTE'
+    )
+    interpolate_frames: bpy.props.BoolProperty(
+        name="Interpolate Frames",
+        description="Interpolate positions, colors and the Scalar attribute between loaded frames with matching topology (single-object storage only)",
+        default=False
+    )
+    animation_storage: bpy.props.EnumProperty(
+        name="Storage",
+        description="How imported animation frames are kept in the scene",
+        items=[
+            ('OBJECTS', "Object per Frame", "Import every frame as a separate object"),
+            ('DELTA', "Keyframes + Deltas", "Import a single object that stores full keyframes and per-vertex deltas in between"),
+            ('STREAM', "Stream from Cache", "Import a single object that reads each frame from an on-disk frame cache when it is shown"),
+        ],
+        default='OBJECTS',
+    )
+    memory_budget: bpy.props.IntProperty(
+        name="Memory Budget (MiB)",
+        description="Memory an animation import may use before it switches to delta or streamed storage (0 uses half of the physical memory)",
+        default=0,
+        min=0
+    )
+    keyframe_interval: bpy.props.IntProperty(
+        name="Keyframe Interval",
+        description="Store a full keyframe every N frames when using delta storage",
+        default=10,
+        min=1
+    )
+    cache_directory: bpy.props.StringProperty(
+        name="Cache Directory",
+        description="Where single-object X3D imports write their frame cache (empty uses the folder of the saved .blend file, or Blender's temporary folder)",
+        default="",
+        subtype='DIR_PATH'
+    )
 
 class SciBlendPanel(bpy.types.Panel):
     bl_label = "SciBlend"
@@ -76,6 +126,7 @@ class SciBlendPanel(bpy.types.Panel):
         box.label(text="Import", icon='IMPORT')
         box.operator("import_x3d.static", text="Import Static X3D", icon='IMPORT')
         box.operator("import_x3d.animation", text="Import X3D Animation", icon='SEQUENCE')
+        box.operator("import_sbf.animation", text="Import Compressed Animation", icon='SEQUENCE')
         box.operator("import_vtk.animation", text="Import VTK Animation", icon='SEQUENCE')
 
         box = layout.box()
@@ -85,6 +136,16 @@ class SciBlendPanel(bpy.types.Panel):
         box.prop(settings, "axis_up")
         box.prop(settings, "start_frame_number")
         box.prop(settings, "end_frame_number")
+        box.prop(settings, "frame_stride")
+        box.prop(settings, "target_duration")
+        if settings.target_duration > 0:
+            box.prop(settings, "target_fps")
+        box.prop(settings, "animation_storage")
+        box.prop(settings, "memory_budget")
+        if settings.animation_storage != 'OBJECTS':
+            box.prop(settings, "keyframe_interval")
+            box.prop(settings, "interpolate_frames")
+            box.prop(settings, "cache_directory")
 
         box = layout.box()
         box.label(text="Material", icon='MATERIAL')
@@ -124,6 +185,7 @@ class SciBlendPanel(bpy.types.Panel):
 classes = (
     ImportStaticX3DOperator,
     ImportX3DAnimationOperator,
+    ImportCompressedAnimationOperator,
     CreateSharedMaterialOperator,
     ApplySharedMaterialOperator,
     RemoveAllShadersOperator,
@@ -141,11 +203,6 @@ classes = (
 )
 
 def register():
-    global preview_collection
-    preview_collection = bpy.utils.previews.new()
-    icons_dir = os.path.join(os.path.dirname(__file__), "icons")
-    preview_collection.load("custom_icon", os.path.join(icons_dir, "logo.png"), 'IMAGE')
-
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.x3d_import_settings = bpy.props.PointerProperty(type=X3DImportSettings)
@@ -170,10 +227,10 @@ def register():
         ],
         default='MESHES'
     )
+    sequence_handlers.register()
 
 def unregister():
-    global preview_collection
-    bpy.utils.previews.remove(preview_collection)
+    sequence_handlers.unregister()
 
     for cls in classes:
         bpy.utils.unregister_class(cls)
@@ -0,0 +1,395 @@
+import bpy
+import os
+import hashlib
+import tempfile
+from bpy_extras.io_utils import axis_conversion
+from mathutils import Matrix
+import logging
+
+from ..utils.frame_container import FrameReader, FrameWriter, FrameContainerError, FILE_EXTENSION
+from ..utils.frame_sequence import FrameSequence, StreamedSequence
+from ..utils.import_planning import (
+    plan_frames, next_frames, choose_storage, project_memory, memory_budget_bytes,
+    estimate_from_file_size, FrameEstimate,
+)
+from ..utils.sequence_index import scan_directory, local_copy, format_ranges, X3D_EXTENSIONS
+from ..utils.mesh_data import fill_mesh, extract_frame_data, remove_objects
+from ..utils.sequence_player import SOURCE_PROP, attach_sequence, release_player
+
+logger = logging.getLogger(__name__)
+
+SEQUENCE_CACHE_PREFIX = "sciblend_"
+STATIC_FILE_NAME = "tmpfile.x3d"
+
+
+def get_shared_material(settings):
+    material = settings.shared_material
+
+    if material is None:
+        material = bpy.data.materials.new(name="SharedMaterial")
+        material.use_nodes = True
+        nodes = material.node_tree.nodes
+        links = material.node_tree.links
+
+        for node in nodes:
+            nodes.remove(node)
+
+        attribute_node = nodes.new(type='ShaderNodeAttribute')
+        attribute_node.attribute_name = 'Col'
+
+        bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
+
+        material_output = nodes.new(type='ShaderNodeOutputMaterial')
+
+        links.new(
+            attribute_node.outputs['Color'], bsdf.inputs['Base Color'])
+        links.new(bsdf.outputs['BSDF'], material_output.inputs['Surface'])
+
+    return material
+
+
+def keyframe_visibility(obj, frame, next_frame=None):
+    obj.hide_render = False
+    obj.hide_viewport = False
+    obj.keyframe_insert(data_path="hide_render", frame=frame)
+    obj.keyframe_insert(data_path="hide_viewport", frame=frame)
+
+    obj.hide_render = True
+    obj.hide_viewport = True
+    if frame > 1:
+        obj.keyframe_insert(
+            data_path="hide_render", frame=frame-1)
+        obj.keyframe_insert(
+            data_path="hide_viewport", frame=frame-1)
+    if next_frame is not None:
+        obj.keyframe_insert(
+            data_path="hide_render", frame=next_frame)
+        obj.keyframe_insert(
+            data_path="hide_viewport", frame=next_frame)
+
+
+def set_constant_interpolation():
+    for obj in bpy.data.objects:
+        if obj.animation_data and obj.animation_data.action:
+            for fcurve in obj.animation_data.action.fcurves:
+                for kf in fcurve.keyframe_points:
+                    kf.interpolation = 'CONSTANT'
+
+
+def create_frame_object(context, name, frame_data, material, axis_matrix, scale_factor):
+    mesh = bpy.data.meshes.new(name)
+    fill_mesh(mesh, frame_data)
+    mesh.materials.append(material)
+
+    obj = bpy.data.objects.new(name, mesh)
+    context.collection.objects.link(obj)
+    obj.matrix_world = axis_matrix
+    obj.scale = (scale_factor, scale_factor, scale_factor)
+    return obj
+
+
+def create_sequence_object(context, name, sequence, frames, numbers, material,
+                           axis_matrix, settings, source=None):
+    obj = create_frame_object(context, name, sequence.frame(numbers[0]),
+                              material, axis_matrix, settings.scale_factor)
+    attach_sequence(obj, sequence, frames, numbers, source,
+                    interpolate=settings.interpolate_frames)
+    # The frame change handler rebuilds the mesh, which is only safe during
+    # renders while the interface is locked.
+    context.scene.render.use_lock_interface = True
+    return obj
+
+
+def clear_scene():
+    """Delete every object and the frame caches that only those objects used."""
+    bpy.ops.object.select_all(action='SELECT')
+    caches = set()
+    for obj in bpy.context.selected_objects:
+        source = obj.get(SOURCE_PROP)
+        if source and os.path.basename(source).startswith(SEQUENCE_CACHE_PREFIX):
+            caches.add(os.path.abspath(bpy.path.abspath(source)))
+        release_player(obj)
+    bpy.ops.object.delete()
+
+    for obj in bpy.data.objects:
+        source = obj.get(SOURCE_PROP)
+        if source:
+            caches.discard(os.path.abspath(bpy.path.abspath(source)))
+    for cache_path in caches:
+        try:
+            os.remove(cache_path)
+        except OSError as e:
+            logger.warning(f"Could not remove frame cache {cache_path}: {e}")
+
+
+def setup_scene_timing(scene, settings, scene_length):
+    scene.frame_start = 1
+    scene.frame_end = scene_length
+    if settings.target_duration > 0:
+        scene.render.fps = settings.target_fps
+        scene.render.fps_base = 1.0
+
+
+def sequence_cache_directory(settings):
+    if settings.cache_directory:
+        return bpy.path.abspath(settings.cache_directory)
+    if bpy.data.filepath:
+        return os.path.dirname(bpy.data.filepath)
+    return bpy.app.tempdir
+
+
+def create_sequence_cache(settings, directory):
+    source_key = hashlib.sha1(os.path.abspath(directory).encode()).hexdigest()[:12]
+    fd, cache_path = tempfile.mkstemp(prefix=f"{SEQUENCE_CACHE_PREFIX}{source_key}_",
+                                      suffix=FILE_EXTENSION,
+                                      dir=sequence_cache_directory(settings))
+    os.close(fd)
+    return cache_path
+
+
+def plan_settings_frames(settings, numbers, end_frame=None):
+    if end_frame is None:
+        end_frame = settings.end_frame_number
+    return plan_frames(numbers, settings.start_frame_number, end_frame,
+                       stride=settings.frame_stride, fps=settings.target_fps,
+                       duration=settings.target_duration)
+
+
+def plan_settings_storage(operator, settings, estimates):
+    requested = settings.animation_storage
+    budget = memory_budget_bytes(settings.memory_budget)
+    if budget is None:
+        operator.report({'WARNING'}, "Could not determine the physical memory of this machine; "
+                        "set a Memory Budget to let large imports switch storage instead of "
+                        "running out of memory.")
+    mode, projected = choose_storage(requested, estimates, budget, settings.keyframe_interval)
+    if mode != requested:
+        requested_bytes = project_memory(requested, estimates, settings.keyframe_interval)
+        operator.report({'WARNING'}, f"Importing with {requested} storage would need about "
+                        f"{requested_bytes / 2**20:.0f} MiB, over the {budget / 2**20:.0f} MiB "
+                        f"budget; using {mode} storage ({projected / 2**20:.0f} MiB) instead.")
+    return mode
+
+
+def import_static_x3d(operator, context):
+    settings = context.scene.x3d_import_settings
+    directory = operator.filepath if os.path.isdir(operator.filepath) else os.path.dirname(operator.filepath)
+    scale_factor = settings.scale_factor
+
+    try:
+        index = scan_directory(directory)
+    except OSError as e:
+        operator.report({'ERROR'}, f"Could not read {directory}: {e}")
+        return {'CANCELLED'}
+
+    x3d_file = index.find_file(operator.filepath, STATIC_FILE_NAME, X3D_EXTENSIONS)
+    if x3d_file is None:
+        operator.report({'ERROR'}, f"No X3D file found in {directory}.")
+        return {'CANCELLED'}
+
+    with local_copy(x3d_file.path) as file_path:
+        bpy.ops.import_scene.x3d(filepath=file_path,
+                                 axis_forward=settings.axis_forward,
+                                 axis_up=settings.axis_up)
+    for obj in bpy.context.selected_objects:
+        obj.scale = (scale_factor, scale_factor, scale_factor)
+
+    operator.report({'INFO'}, f"File {x3d_file.path} successfully imported into Blender.")
+    return {'FINISHED'}
+
+
+def import_x3d_animation(operator, context):
+    settings = context.scene.x3d_import_settings
+    scale_factor = settings.scale_factor
+    start_frame = settings.start_frame_number
+    end_frame = settings.end_frame_number
+    directory = operator.filepath if os.path.isdir(operator.filepath) else os.path.dirname(operator.filepath)
+
+    try:
+        sequence_index = scan_directory(directory).find_sequence(operator.filepath, X3D_EXTENSIONS)
+    except OSError as e:
+        operator.report({'ERROR'}, f"Could not read {directory}: {e}")
+        return {'CANCELLED'}
+
+    if sequence_index is None:
+        operator.report({'ERROR'}, f"No numbered X3D files found in {directory}.")
+        return {'CANCELLED'}
+
+    end_frame = min(end_frame, sequence_index.last)
+    missing = sequence_index.missing(start_frame, end_frame, settings.frame_stride)
+    if missing:
+        operator.report({'WARNING'}, f"{len(missing)} frames of {sequence_index.name} are missing: "
+                        f"{format_ranges(missing)}.")
+
+    plan, scene_length = plan_settings_frames(settings, sequence_index.numbers, end_frame=end_frame)
+    if not plan:
+        operator.report({'ERROR'}, f"No frames of {sequence_index.name} between {start_frame} and {end_frame}.")
+        return {'CANCELLED'}
+    x3d_plan = [(frame, number, sequence_index.path(number)) for frame, number in plan]
+
+    compressed = sequence_index.compression is not None or sequence_index.base_extension == ".x3dz"
+    try:
+        samples = {plan[0][1], plan[len(plan) // 2][1], plan[-1][1]}
+        largest = max(sequence_index.file_size(number) for number in samples)
+        estimates = [estimate_from_file_size(largest, compressed)] * len(plan)
+    except OSError as e:
+        operator.report({'ERROR'}, f"Could not read {sequence_index.name} in {directory}: {e}")
+        return {'CANCELLED'}
+    storage = plan_settings_storage(operator, settings, estimates)
+
+    cache_path = None
+    if storage != 'OBJECTS':
+        try:
+            cache_path = create_sequence_cache(settings, directory)
+        except OSError as e:
+            operator.report({'ERROR'}, f"Could not create a frame cache in "
+                            f"{sequence_cache_directory(settings)}: {e}")
+            return {'CANCELLED'}
+        if not settings.cache_directory and not bpy.data.filepath:
+            operator.report({'WARNING'}, "The .blend file is not saved, so the frame cache is written to "
+                            "Blender's temporary folder and the animation will be lost when the file "
+                            "is reopened; save first or set a Cache Directory.")
+
+    clear_scene()
+
+    material = get_shared_material(settings)
+
+    setup_scene_timing(bpy.context.scene, settings, scene_length)
+
+    if cache_path is not None:
+        return import_x3d_sequence(operator, context, settings, cache_path, x3d_plan, material,
+                                   streamed=storage == 'STREAM')
+
+    for (frame, number, x3d_file), next_frame in zip(x3d_plan, next_frames(x3d_plan)):
+        with local_copy(x3d_file) as file_path:
+            bpy.ops.import_scene.x3d(filepath=file_path,
+                                     axis_forward=settings.axis_forward,
+                                     axis_up=settings.axis_up)
+
+        imported_objects = bpy.context.selected_objects
+
+        for obj in imported_objects:
+            if obj.type == 'MESH':
+                obj.scale = (scale_factor, scale_factor, scale_factor)
+                obj.data.materials.clear()
+                obj.data.materials.append(material)
+
+            keyframe_visibility(obj, frame, next_frame)
+
+    set_constant_interpolation()
+
+    operator.report({'INFO'}, "Import and configuration completed.")
+    return {'FINISHED'}
+
+
+def import_x3d_sequence(operator, context, settings, cache_path, x3d_plan, material, streamed=False):
+    sequence = None if streamed else FrameSequence(settings.keyframe_interval)
+    frames = []
+    numbers = []
+
+    try:
+        with FrameWriter(cache_path, keyframe_interval=settings.keyframe_interval) as writer:
+            for frame, number, x3d_file in x3d_plan:
+                with local_copy(x3d_file) as file_path:
+                    bpy.ops.import_scene.x3d(filepath=file_path,
+                                             axis_forward=settings.axis_forward,
+                                             axis_up=settings.axis_up)
+                imported_objects = list(bpy.context.selected_objects)
+                frame_data = extract_frame_data(imported_objects)
+                remove_objects(imported_objects)
+
+                if frame_data is None:
+                    operator.report({'WARNING'}, f"File {x3d_file} contains no meshes.")
+                    continue
+
+                if sequence is not None:
+                    sequence.add(number, frame_data)
+                writer.write_frame(number, *frame_data)
+                frames.append(frame)
+                numbers.append(number)
+    except OSError as e:
+        os.remove(cache_path)
+        operator.report({'ERROR'}, f"Could not write the frame cache {cache_path}: {e}")
+        return {'CANCELLED'}
+
+    if not numbers:
+        os.remove(cache_path)
+        operator.report({'ERROR'}, "No frames were imported.")
+        return {'CANCELLED'}
+
+    if streamed:
+        sequence = StreamedSequence(cache_path, numbers, settings.keyframe_interval)
+    create_sequence_object(context, "X3DSequence", sequence, frames, numbers, material,
+                           Matrix.Identity(4), settings, source=cache_path)
+
+    if streamed:
+        operator.report({'INFO'}, f"Imported {len(numbers)} frames, streamed from {cache_path}.")
+    else:
+        operator.report({'INFO'}, f"Imported {len(numbers)} frames as a delta sequence "
+                        f"({sequence.nbytes / 2**20:.1f} MiB in memory).")
+    return {'FINISHED'}
+
+
+def import_compressed_animation(operator, context):
+    settings = context.scene.x3d_import_settings
+    scale_factor = settings.scale_factor
+    start_frame = settings.start_frame_number
+    end_frame = settings.end_frame_number
+
+    try:
+        reader = FrameReader(operator.filepath)
+    except (OSError, FrameContainerError) as e:
+        operator.report({'ERROR'}, f"Could not open {operator.filepath}: {e}")
+        return {'CANCELLED'}
+
+    with reader:
+        available = [n for n in reader.frame_numbers if start_frame <= n <= end_frame]
+        if not available:
+            operator.report({'ERROR'}, f"No frames between {start_frame} and {end_frame} in {operator.filepath}.")
+            return {'CANCELLED'}
+
+        plan, scene_length = plan_settings_frames(settings, available, end_frame=max(available))
+        if not plan:
+            operator.report({'ERROR'}, f"No frames match a stride of {settings.frame_stride} in {operator.filepath}.")
+            return {'CANCELLED'}
+        frames = [frame for frame, _ in plan]
+        frame_numbers = [number for _, number in plan]
+
+        samples = {frame_numbers[0], frame_numbers[len(frame_numbers) // 2], frame_numbers[-1]}
+        counts = [reader.frame_counts(number) for number in samples]
+        estimate = FrameEstimate(max(c[0] for c in counts), max(c[1] for c in counts))
+        storage = plan_settings_storage(operator, settings, [estimate] * len(plan))
+
+        clear_scene()
+
+        material = get_shared_material(settings)
+        axis_matrix = axis_conversion(from_forward=settings.axis_forward,
+                                      from_up=settings.axis_up).to_4x4()
+
+        setup_scene_timing(bpy.context.scene, settings, scene_length)
+
+        if storage == 'STREAM':
+            sequence = StreamedSequence(operator.filepath, frame_numbers)
+            create_sequence_object(context, "SBFSequence", sequence, frames, frame_numbers,
+                                   material, axis_matrix, settings, source=operator.filepath)
+            operator.report({'INFO'}, f"Imported {len(frame_numbers)} compressed frames, "
+                            f"streamed from {operator.filepath}.")
+            return {'FINISHED'}
+
+        if storage == 'DELTA':
+            sequence = FrameSequence.from_reader(reader, frame_numbers, settings.keyframe_interval)
+            create_sequence_object(context, "SBFSequence", sequence, frames, frame_numbers,
+                                   material, axis_matrix, settings, source=operator.filepath)
+            operator.report({'INFO'}, f"Imported {len(frame_numbers)} compressed frames as a delta sequence "
+                            f"({sequence.nbytes / 2**20:.1f} MiB in memory).")
+            return {'FINISHED'}
+
+        for (frame, number), next_frame in zip(plan, next_frames(plan)):
+            obj = create_frame_object(context, f"Frame_{number}", reader.read_frame(number),
+                                      material, axis_matrix, scale_factor)
+            keyframe_visibility(obj, frame, next_frame)
+
+    set_constant_interpolation()
+
+    operator.report({'INFO'}, f"Imported {len(frame_numbers)} compressed frames.")
+    return {'FINISHED'}
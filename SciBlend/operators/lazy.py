@@ -0,0 +1,13 @@
+import importlib
+
+
+class LazyExecuteMixin:
+    """Operator mixin that imports its implementation module on the first
+    ``execute``, so registering the addon does not pay for heavy imports."""
+
+    implementation = None
+
+    def execute(self, context):
+        module_name, function_name = self.implementation
+        module = importlib.import_module(f".{module_name}", __package__)
+        return getattr(module, function_name)(self, context)
@@ -0,0 +1,348 @@
+"""Compressed binary frame container (.sbf) shared by the ParaView export macro
+and the Blender importers.
+
+Layout (little endian)::
+
+    header   magic "SBF1", version u16, codec u8, reserved u8,
+             frame count u32, index offset u64
+    frames   per frame: chunk count u16, then chunks
+    chunk    tag 4s, dtype code u8, raw length u32, stored length u32, data
+    index    per frame: frame number u32, offset u64, length u32
+
+Positions are quantized to 16 bits relative to the frame bounds and stored
+component-planar, triangle indices are delta encoded, and every chunk is
+compressed on its own so any frame can be decoded with a single seek. Chunk
+data is little endian with a fixed dtype per code (1 uint8, 2 uint16, 3 int32,
+4 uint32, 5 float32), so files move between platforms unchanged; version 1
+files stored NumPy dtype characters instead, which are still read.
+
+With a keyframe interval above one, frames whose topology matches the last
+keyframe are stored as deltas against it (quantized position offsets, wrapping
+color offsets and scalar offsets), so decoding any frame needs at most one
+keyframe and one delta.
+"""
+
+import lzma
+import struct
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b"SBF1"
+VERSION = 2
+FILE_EXTENSION = ".sbf"
+
+CODEC_ZLIB = 0
+CODEC_LZMA = 1
+CODECS = {'ZLIB': CODEC_ZLIB, 'LZMA': CODEC_LZMA}
+
+QUANT_LEVELS = 65535
+
+_HEADER = struct.Struct("<4sHBBIQ")
+_FRAME = struct.Struct("<H")
+_CHUNK = struct.Struct("<4sBII")
+_INDEX_ENTRY = struct.Struct("<IQI")
+
+_DTYPES = {
+    1: np.dtype("<u1"),
+    2: np.dtype("<u2"),
+    3: np.dtype("<i4"),
+    4: np.dtype("<u4"),
+    5: np.dtype("<f4"),
+}
+_DTYPE_CODES = {(dtype.kind, dtype.itemsize): code for code, dtype in _DTYPES.items()}
+# Version 1 stored ``ord(dtype.char)``; every integer chunk was 32 bits wide,
+# whether NumPy called it 'i'/'I' or, on Windows, 'l'/'L'.
+_LEGACY_DTYPES = {ord(char): _DTYPES[code] for char, code in
+                  (("B", 1), ("H", 2), ("i", 3), ("l", 3), ("I", 4), ("L", 4), ("f", 5))}
+
+FrameData = namedtuple("FrameData", "positions indices colors scalars")
+FrameEntry = namedtuple("FrameEntry", "number offset length")
+
+
+class FrameContainerError(Exception):
+    pass
+
+
+def quantize_positions(positions):
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    if len(positions) == 0:
+        return np.zeros(6, dtype=np.float32), np.zeros((0, 3), dtype=np.uint16)
+    lo = positions.min(axis=0)
+    hi = positions.max(axis=0)
+    extent = hi - lo
+    scale = np.divide(QUANT_LEVELS, extent, out=np.zeros_like(extent), where=extent > 0)
+    quantized = np.rint((positions - lo) * scale).astype(np.uint16)
+    return np.concatenate((lo, hi)).astype(np.float32), quantized
+
+
+def dequantize_positions(bounds, quantized):
+    lo = bounds[:3]
+    step = (bounds[3:] - lo) / QUANT_LEVELS
+    return (quantized.astype(np.float32) * step + lo).astype(np.float32)
+
+
+def delta_encode_indices(indices):
+    indices = np.asarray(indices, dtype=np.int64).ravel()
+    return np.diff(indices, prepend=0).astype(np.int32)
+
+
+def delta_decode_indices(deltas):
+    return np.cumsum(deltas, dtype=np.int64).astype(np.int32)
+
+
+def encode_frame(positions, indices, colors=None, scalars=None):
+    bounds, quantized = quantize_positions(positions)
+    chunks = {
+        b"BNDS": bounds,
+        b"POSQ": np.ascontiguousarray(quantized.T),
+        b"IDXD": delta_encode_indices(indices),
+    }
+    if colors is not None:
+        chunks[b"COLR"] = np.asarray(colors, dtype=np.uint8).reshape(len(quantized), -1)
+    if scalars is not None:
+        chunks[b"SCAL"] = np.asarray(scalars, dtype=np.float32).ravel()
+    return chunks
+
+
+def decode_frame(chunks):
+    quantized = chunks[b"POSQ"].reshape(3, -1).T
+    positions = dequantize_positions(chunks[b"BNDS"], quantized)
+    indices = delta_decode_indices(chunks[b"IDXD"])
+    colors = chunks.get(b"COLR")
+    if colors is not None:
+        colors = colors.reshape(len(positions), -1)
+    return FrameData(positions, indices, colors, chunks.get(b"SCAL"))
+
+
+def topology_matches(a, b):
+    return (len(a.positions) == len(b.positions)
+            and (a.colors is None) == (b.colors is None)
+            and (a.scalars is None) == (b.scalars is None)
+            and np.array_equal(a.indices, b.indices))
+
+
+def encode_delta(key_number, key, frame_data):
+    bounds, quantized = quantize_positions(frame_data.positions - key.positions)
+    chunks = {
+        b"KREF": np.array([key_number], dtype=np.uint32),
+        b"DBND": bounds,
+        b"DPOQ": np.ascontiguousarray(quantized.T),
+    }
+    if frame_data.colors is not None:
+        chunks[b"DCOL"] = np.asarray(frame_data.colors, dtype=np.uint8) - key.colors
+    if frame_data.scalars is not None:
+        chunks[b"DSCA"] = np.asarray(frame_data.scalars, dtype=np.float32) - key.scalars
+    return chunks
+
+
+def is_delta(chunks):
+    return b"KREF" in chunks
+
+
+def delta_keyframe(chunks):
+    return int(chunks[b"KREF"][0])
+
+
+def apply_delta(key, chunks):
+    offsets = dequantize_positions(chunks[b"DBND"], chunks[b"DPOQ"].reshape(3, -1).T)
+    colors = key.colors
+    if colors is not None:
+        colors = colors + chunks[b"DCOL"].reshape(colors.shape)
+    scalars = key.scalars
+    if scalars is not None:
+        scalars = scalars + chunks[b"DSCA"]
+    return FrameData(key.positions + offsets, key.indices, colors, scalars)
+
+
+def interpolate_frames(a, b, t):
+    positions = a.positions + (b.positions - a.positions) * np.float32(t)
+    colors = a.colors
+    if colors is not None:
+        blended = colors + (b.colors.astype(np.float32) - colors) * t
+        colors = np.rint(blended).astype(np.uint8)
+    scalars = a.scalars
+    if scalars is not None:
+        scalars = scalars + (b.scalars - scalars) * np.float32(t)
+    return FrameData(positions, a.indices, colors, scalars)
+
+
+def as_frame_data(positions, indices, colors=None, scalars=None):
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    if colors is not None:
+        colors = np.asarray(colors, dtype=np.uint8).reshape(len(positions), -1)
+    if scalars is not None:
+        scalars = np.asarray(scalars, dtype=np.float32).ravel()
+    return FrameData(positions, np.asarray(indices, dtype=np.int32).ravel(), colors, scalars)
+
+
+def _compress(codec, data, level):
+    if codec == CODEC_LZMA:
+        return lzma.compress(data, preset=level)
+    return zlib.compress(data, level)
+
+
+def _decompress(codec, data):
+    if codec == CODEC_LZMA:
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+class FrameWriter:
+    def __init__(self, path, codec='ZLIB', level=6, keyframe_interval=1):
+        if codec not in CODECS:
+            raise FrameContainerError(f"Unknown codec {codec!r}.")
+        self.path = path
+        self.codec = CODECS[codec]
+        self.level = level
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.entries = []
+        self._key = None
+        self._since_key = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self.codec, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_frame(self, number, positions, indices, colors=None, scalars=None):
+        frame_data = as_frame_data(positions, indices, colors, scalars)
+        if (self._key is not None and self._since_key < self.keyframe_interval
+                and topology_matches(self._key[1], frame_data)):
+            self.write_chunks(number, encode_delta(*self._key, frame_data))
+            self._since_key += 1
+            return
+
+        chunks = encode_frame(*frame_data)
+        self.write_chunks(number, chunks)
+        self._key = (number, decode_frame(chunks))
+        self._since_key = 1
+
+    def write_chunks(self, number, chunks):
+        parts = [_FRAME.pack(len(chunks))]
+        for tag, array in chunks.items():
+            array = np.ascontiguousarray(array)
+            code = _DTYPE_CODES.get((array.dtype.kind, array.dtype.itemsize))
+            if code is None:
+                raise FrameContainerError(f"Chunk {tag!r} has unsupported dtype {array.dtype}.")
+            raw = array.astype(_DTYPES[code], copy=False).tobytes()
+            stored = _compress(self.codec, raw, self.level)
+            parts.append(_CHUNK.pack(tag, code, len(raw), len(stored)))
+            parts.append(stored)
+        payload = b"".join(parts)
+        offset = self._file.tell()
+        self._file.write(payload)
+        self.entries.append(FrameEntry(number, offset, len(payload)))
+
+    def close(self):
+        if self._file is None:
+            return
+        index_offset = self._file.tell()
+        for entry in self.entries:
+            self._file.write(_INDEX_ENTRY.pack(*entry))
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self.codec, 0,
+                                      len(self.entries), index_offset))
+        self._file.close()
+        self._file = None
+
+
+class FrameReader:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        header = self._file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            self._file.close()
+            raise FrameContainerError(f"{path} is not a SciBlend frame container.")
+        magic, self.version, self.codec, _, count, index_offset = _HEADER.unpack(header)
+        if magic != MAGIC or self.version > VERSION:
+            self._file.close()
+            raise FrameContainerError(f"{path} is not a supported SciBlend frame container.")
+        if index_offset == 0:
+            self._file.close()
+            raise FrameContainerError(f"{path} was not closed properly and has no frame index.")
+
+        self._file.seek(index_offset)
+        table = self._file.read(_INDEX_ENTRY.size * count)
+        self.entries = [FrameEntry(*entry) for entry in _INDEX_ENTRY.iter_unpack(table)]
+        self._by_number = {entry.number: entry for entry in self.entries}
+        self._dtypes = _DTYPES if self.version >= 2 else _LEGACY_DTYPES
+        self._cached_key = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, number):
+        return number in self._by_number
+
+    @property
+    def frame_numbers(self):
+        return [entry.number for entry in self.entries]
+
+    def read_chunks(self, number):
+        entry = self._by_number.get(number)
+        if entry is None:
+            raise KeyError(number)
+        self._file.seek(entry.offset)
+        payload = memoryview(self._file.read(entry.length))
+
+        (chunk_count,) = _FRAME.unpack_from(payload, 0)
+        position = _FRAME.size
+        chunks = {}
+        for _ in range(chunk_count):
+            tag, code, raw_length, stored_length = _CHUNK.unpack_from(payload, position)
+            position += _CHUNK.size
+            raw = _decompress(self.codec, payload[position:position + stored_length])
+            position += stored_length
+            if len(raw) != raw_length or code not in self._dtypes:
+                raise FrameContainerError(f"Corrupt chunk {tag!r} in frame {number}.")
+            chunks[tag] = np.frombuffer(raw, dtype=self._dtypes[code])
+        return chunks
+
+    def chunk_sizes(self, number):
+        entry = self._by_number.get(number)
+        if entry is None:
+            raise KeyError(number)
+        self._file.seek(entry.offset)
+        (chunk_count,) = _FRAME.unpack(self._file.read(_FRAME.size))
+        sizes = {}
+        for _ in range(chunk_count):
+            tag, _, raw_length, stored_length = _CHUNK.unpack(self._file.read(_CHUNK.size))
+            sizes[tag] = raw_length
+            self._file.seek(stored_length, 1)
+        return sizes
+
+    def frame_counts(self, number):
+        sizes = self.chunk_sizes(number)
+        if b"KREF" in sizes:
+            sizes = self.chunk_sizes(delta_keyframe(self.read_chunks(number)))
+        return sizes[b"POSQ"] // 6, sizes[b"IDXD"] // 4
+
+    def read_keyed_frame(self, number):
+        chunks = self.read_chunks(number)
+        if not is_delta(chunks):
+            return number, decode_frame(chunks)
+
+        key_number = delta_keyframe(chunks)
+        if self._cached_key is None or self._cached_key[0] != key_number:
+            self._cached_key = (key_number, decode_frame(self.read_chunks(key_number)))
+        return key_number, apply_delta(self._cached_key[1], chunks)
+
+    def read_frame(self, number):
+        return self.read_keyed_frame(number)[1]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+from .frame_container import (
+    FrameReader, apply_delta, as_frame_data, encode_delta, topology_matches,
+)
+
+
+class FrameSequence:
+    """In-memory animation that keeps a full keyframe every ``keyframe_interval``
+    frames and stores the frames in between as quantized deltas against it."""
+
+    def __init__(self, keyframe_interval=10):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._keyframes = {}
+        self._deltas = {}
+        self._key_of = {}
+        self._last_key = None
+        self._since_key = 0
+
+    def __len__(self):
+        return len(self._key_of)
+
+    def __contains__(self, number):
+        return number in self._key_of
+
+    @property
+    def numbers(self):
+        return sorted(self._key_of)
+
+    @property
+    def nbytes(self):
+        total = 0
+        for frame_data in self._keyframes.values():
+            total += sum(a.nbytes for a in frame_data if a is not None)
+        for chunks in self._deltas.values():
+            total += sum(a.nbytes for a in chunks.values())
+        return total
+
+    def add(self, number, frame_data):
+        frame_data = as_frame_data(*frame_data)
+        key = self._keyframes.get(self._last_key)
+        if (key is not None and self._since_key < self.keyframe_interval
+                and topology_matches(key, frame_data)):
+            self._deltas[number] = encode_delta(self._last_key, key, frame_data)
+            self._key_of[number] = self._last_key
+            self._since_key += 1
+            return
+
+        self._keyframes[number] = frame_data
+        self._key_of[number] = number
+        self._last_key = number
+        self._since_key = 1
+
+    def keyframe_of(self, number):
+        return self._key_of[number]
+
+    def same_topology(self, a, b):
+        if self._key_of[a] == self._key_of[b]:
+            return True
+        return topology_matches(self.frame(a), self.frame(b))
+
+    def frame(self, number):
+        key_number = self._key_of[number]
+        key = self._keyframes[key_number]
+        if key_number == number:
+            return key
+        return apply_delta(key, self._deltas[number])
+
+    @classmethod
+    def from_reader(cls, reader, numbers, keyframe_interval=10):
+        sequence = cls(keyframe_interval)
+        for number in numbers:
+            sequence.add(number, reader.read_frame(number))
+        return sequence
+
+
+class StreamedSequence:
+    """Frame source with the ``FrameSequence`` interface that decodes frames from
+    a container on demand, keeping only a couple of recent frames resident."""
+
+    def __init__(self, path, numbers, keyframe_interval=1, cached_frames=2):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.cached_frames = cached_frames
+        self._reader = FrameReader(path)
+        self._numbers = sorted(numbers)
+        self._key_of = {}
+        self._recent = OrderedDict()
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def __contains__(self, number):
+        return number in self._reader
+
+    @property
+    def numbers(self):
+        return list(self._numbers)
+
+    @property
+    def nbytes(self):
+        return sum(sum(a.nbytes for a in frame_data if a is not None)
+                   for frame_data in self._recent.values())
+
+    def keyframe_of(self, number):
+        if number not in self._key_of:
+            self.frame(number)
+        return self._key_of[number]
+
+    def same_topology(self, a, b):
+        if self.keyframe_of(a) == self.keyframe_of(b):
+            return True
+        return topology_matches(self.frame(a), self.frame(b))
+
+    def frame(self, number):
+        if number in self._recent:
+            self._recent.move_to_end(number)
+            return self._recent[number]
+
+        key_number, frame_data = self._reader.read_keyed_frame(number)
+        self._key_of[number] = key_number
+        self._recent[number] = frame_data
+        while len(self._recent) > self.cached_frames:
+            self._recent.popitem(last=False)
+        return frame_data
+
+    def close(self):
+        self._recent.clear()
+        self._reader.close()
@@ -0,0 +1,138 @@
+import os
+from collections import namedtuple
+
+
+def plan_frames(numbers, start_frame, end_frame, stride=1, fps=24, duration=0.0):
+    """Select every ``stride``-th file number in ``[start_frame, end_frame]`` and map
+    it to a scene frame.
+
+    With ``duration`` of zero every file number keeps its own scene frame, so a
+    strided import has the same timing as a full one. Otherwise the range is
+    stretched onto ``duration * fps`` scene frames, keeping the file closest to
+    each scene frame when several land on it. Returns the list of
+    ``(scene_frame, number)`` pairs and the scene length.
+    """
+    stride = max(1, stride)
+    span = end_frame - start_frame
+    if duration > 0:
+        scene_length = max(1, round(duration * fps))
+    else:
+        scene_length = span + 1
+
+    best = {}
+    for number in numbers:
+        if not start_frame <= number <= end_frame or (number - start_frame) % stride:
+            continue
+        position = (number - start_frame) * (scene_length - 1) / span if span else 0.0
+        frame = 1 + round(position)
+        error = abs(position - round(position))
+        if frame not in best or error < best[frame][0]:
+            best[frame] = (error, number)
+
+    plan = [(frame, number) for frame, (_, number) in sorted(best.items())]
+    return plan, scene_length
+
+
+def next_frames(plan):
+    frames = [entry[0] for entry in plan]
+    return frames[1:] + [None]
+
+
+STORAGE_MODES = ('OBJECTS', 'DELTA', 'STREAM')
+
+# Rough X3D text cost per vertex: coordinates, colors and about two triangles of indices.
+X3D_BYTES_PER_VERTEX = 100
+INDICES_PER_VERTEX = 6
+COMPRESSION_RATIO = 4
+
+# Resident Blender mesh cost: positions, normals and colors per vertex; corner, edge,
+# face and loop-triangle data per triangle corner.
+MESH_BYTES_PER_VERTEX = 32
+MESH_BYTES_PER_INDEX = 24
+
+FrameEstimate = namedtuple("FrameEstimate", "vertices indices")
+
+
+def estimate_from_file_size(size, compressed=False):
+    if compressed:
+        size *= COMPRESSION_RATIO
+    vertices = size // X3D_BYTES_PER_VERTEX
+    return FrameEstimate(vertices, vertices * INDICES_PER_VERTEX)
+
+
+def mesh_bytes(estimate):
+    return estimate.vertices * MESH_BYTES_PER_VERTEX + estimate.indices * MESH_BYTES_PER_INDEX
+
+
+def frame_data_bytes(estimate, delta=False):
+    if delta:
+        return estimate.vertices * (6 + 3 + 4)
+    return estimate.vertices * (12 + 3 + 4) + estimate.indices * 4
+
+
+def project_memory(mode, estimates, keyframe_interval=1):
+    if not estimates:
+        return 0
+    largest = max(estimates, key=mesh_bytes)
+    if mode == 'OBJECTS':
+        return sum(mesh_bytes(e) for e in estimates)
+    if mode == 'DELTA':
+        keyframe_interval = max(1, keyframe_interval)
+        stored = sum(frame_data_bytes(e, delta=i % keyframe_interval != 0)
+                     for i, e in enumerate(estimates))
+        return mesh_bytes(largest) + stored
+    return mesh_bytes(largest) + 3 * frame_data_bytes(largest)
+
+
+def _windows_physical_memory():
+    import ctypes
+
+    class MemoryStatusEx(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", ctypes.c_ulong),
+            ("dwMemoryLoad", ctypes.c_ulong),
+            ("ullTotalPhys", ctypes.c_ulonglong),
+            ("ullAvailPhys", ctypes.c_ulonglong),
+            ("ullTotalPageFile", ctypes.c_ulonglong),
+            ("ullAvailPageFile", ctypes.c_ulonglong),
+            ("ullTotalVirtual", ctypes.c_ulonglong),
+            ("ullAvailVirtual", ctypes.c_ulonglong),
+            ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+        ]
+
+    status = MemoryStatusEx()
+    status.dwLength = ctypes.sizeof(MemoryStatusEx)
+    if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+        return None
+    return status.ullTotalPhys
+
+
+def physical_memory():
+    if os.name == "nt":
+        try:
+            return _windows_physical_memory()
+        except (ImportError, AttributeError, OSError):
+            return None
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def memory_budget_bytes(budget_mb):
+    """Budget in bytes for a setting in MiB; zero means half of physical memory
+    and ``None`` is returned when that cannot be determined."""
+    if budget_mb > 0:
+        return budget_mb * 2**20
+    total = physical_memory()
+    return None if total is None else total // 2
+
+
+def choose_storage(requested, estimates, budget, keyframe_interval=1):
+    """Return the first storage mode, starting at ``requested`` and moving towards
+    streaming, whose projected memory fits ``budget``, with that projection."""
+    modes = STORAGE_MODES[STORAGE_MODES.index(requested):]
+    for mode in modes:
+        projected = project_memory(mode, estimates, keyframe_interval)
+        if budget is None or projected <= budget or mode == modes[-1]:
+            return mode, projected
@@ -0,0 +1,122 @@
+import bpy
+import numpy as np
+
+from .frame_container import FrameData
+
+COLOR_ATTRIBUTE = "Col"
+SCALAR_ATTRIBUTE = "Scalar"
+
+
+def _set_colors(mesh, colors):
+    rgba = np.ones((len(colors), 4), dtype=np.float32)
+    rgba[:, :min(colors.shape[1], 4)] = colors[:, :4] / 255.0
+    attribute = mesh.color_attributes.get(COLOR_ATTRIBUTE)
+    if attribute is None:
+        attribute = mesh.color_attributes.new(name=COLOR_ATTRIBUTE, type='BYTE_COLOR', domain='POINT')
+    attribute.data.foreach_set("color_srgb", rgba.ravel())
+
+
+def _set_scalars(mesh, scalars):
+    attribute = mesh.attributes.get(SCALAR_ATTRIBUTE)
+    if attribute is None:
+        attribute = mesh.attributes.new(name=SCALAR_ATTRIBUTE, type='FLOAT', domain='POINT')
+    attribute.data.foreach_set("value", scalars)
+
+
+def fill_mesh(mesh, frame_data):
+    positions = frame_data.positions
+    indices = frame_data.indices
+    loop_count = len(indices)
+
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", positions.ravel())
+    mesh.loops.add(loop_count)
+    mesh.loops.foreach_set("vertex_index", indices)
+    mesh.polygons.add(loop_count // 3)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, loop_count, 3, dtype=np.int32))
+
+    if frame_data.colors is not None:
+        _set_colors(mesh, frame_data.colors)
+    if frame_data.scalars is not None:
+        _set_scalars(mesh, frame_data.scalars)
+
+    mesh.update()
+    mesh.validate(clean_customdata=False)
+
+
+def update_mesh_frame(mesh, frame_data):
+    mesh.vertices.foreach_set("co", frame_data.positions.ravel())
+    if frame_data.colors is not None:
+        _set_colors(mesh, frame_data.colors)
+    if frame_data.scalars is not None:
+        _set_scalars(mesh, frame_data.scalars)
+    mesh.update()
+
+
+def replace_mesh_frame(mesh, frame_data):
+    mesh.clear_geometry()
+    fill_mesh(mesh, frame_data)
+
+
+def _vertex_colors(mesh):
+    attribute = mesh.color_attributes.get(COLOR_ATTRIBUTE) or mesh.color_attributes.active_color
+    if attribute is None or attribute.domain not in {'POINT', 'CORNER'}:
+        return None
+
+    values = np.empty(len(attribute.data) * 4, dtype=np.float32)
+    attribute.data.foreach_get("color_srgb", values)
+    values = values.reshape(-1, 4)[:, :3]
+
+    if attribute.domain == 'CORNER':
+        loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertices)
+        per_vertex = np.zeros((len(mesh.vertices), 3), dtype=np.float32)
+        per_vertex[loop_vertices] = values
+        values = per_vertex
+
+    return np.rint(values * 255.0).astype(np.uint8)
+
+
+def extract_frame_data(objects):
+    positions = []
+    indices = []
+    colors = []
+    offset = 0
+
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        mesh = obj.data
+
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        matrix = np.array(obj.matrix_world, dtype=np.float32)
+        co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+        mesh.calc_loop_triangles()
+        triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", triangles)
+
+        positions.append(co)
+        indices.append(triangles + offset)
+        colors.append(_vertex_colors(mesh))
+        offset += len(co)
+
+    if not positions:
+        return None
+
+    if any(c is None for c in colors):
+        colors = None
+    else:
+        colors = np.concatenate(colors)
+    return FrameData(np.concatenate(positions).astype(np.float32),
+                     np.concatenate(indices), colors, None)
+
+
+def remove_objects(objects):
+    meshes = [obj.data for obj in objects if obj.type == 'MESH']
+    for obj in objects:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for mesh in meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
@@ -0,0 +1,44 @@
+import importlib
+import sys
+
+import bpy
+from bpy.app.handlers import persistent
+
+FRAMES_PROP = "sciblend_frames"
+
+_PLAYER_MODULE = f"{__package__}.sequence_player"
+
+
+@persistent
+def on_frame_change(scene, depsgraph=None):
+    objects = [obj for obj in scene.objects if obj.type == 'MESH' and FRAMES_PROP in obj]
+    if not objects:
+        return
+
+    player_module = importlib.import_module(_PLAYER_MODULE)
+    for obj in objects:
+        player_module.show_frame(obj, scene.frame_current + scene.frame_subframe)
+
+
+def _clear_players():
+    player_module = sys.modules.get(_PLAYER_MODULE)
+    if player_module is not None:
+        player_module.clear_players()
+
+
+@persistent
+def on_load(*args):
+    _clear_players()
+
+
+def register():
+    bpy.app.handlers.frame_change_pre.append(on_frame_change)
+    bpy.app.handlers.load_post.append(on_load)
+
+
+def unregister():
+    if on_frame_change in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.remove(on_frame_change)
+    if on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load)
+    _clear_players()
@@ -0,0 +1,196 @@
+import bz2
+import gzip
+import lzma
+import os
+import re
+import shutil
+import tempfile
+from collections import namedtuple
+from contextlib import contextmanager
+
+X3D_EXTENSIONS = (".x3d", ".x3dz")
+VTK_EXTENSIONS = (".vtu", ".vtp", ".vtk")
+CONTAINER_EXTENSIONS = (".sbf",)
+SUPPORTED_EXTENSIONS = X3D_EXTENSIONS + VTK_EXTENSIONS + CONTAINER_EXTENSIONS
+
+COMPRESSION_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+GZIP_ALIASES = {".x3dz": ".x3d"}
+
+_NUMBERED = re.compile(r"^(?P<prefix>.*?)(?P<number>\d+)(?P<extension>\.[^.]+(?:\.(?:gz|bz2|xz))?)$",
+                       re.IGNORECASE)
+
+IndexedFile = namedtuple("IndexedFile", "name path")
+SequenceFile = namedtuple("SequenceFile", "number path")
+
+_cache = {}
+
+
+def split_extension(name):
+    """Return ``(base_extension, compression)`` of ``name``, e.g. ``(".x3d", ".gz")``."""
+    root, extension = os.path.splitext(name.lower())
+    if extension in COMPRESSION_OPENERS:
+        return os.path.splitext(root)[1], extension
+    return extension, None
+
+
+def is_supported(name, extensions=SUPPORTED_EXTENSIONS):
+    return split_extension(name)[0] in extensions
+
+
+def format_ranges(numbers):
+    parts = []
+    numbers = sorted(numbers)
+    i = 0
+    while i < len(numbers):
+        j = i
+        while j + 1 < len(numbers) and numbers[j + 1] == numbers[j] + 1:
+            j += 1
+        parts.append(str(numbers[i]) if i == j else f"{numbers[i]}-{numbers[j]}")
+        i = j + 1
+    return ", ".join(parts)
+
+
+class SequenceIndex:
+    def __init__(self, directory, prefix, extension, files):
+        self.directory = directory
+        self.prefix = prefix
+        self.extension = extension
+        self.files = sorted(files)
+        self.base_extension, self.compression = split_extension(self.files[0].path)
+        self._by_number = {f.number: f for f in self.files}
+
+    def __len__(self):
+        return len(self.files)
+
+    def __contains__(self, number):
+        return number in self._by_number
+
+    @property
+    def name(self):
+        return f"{self.prefix}#{self.extension}"
+
+    @property
+    def numbers(self):
+        return [f.number for f in self.files]
+
+    @property
+    def first(self):
+        return self.files[0].number
+
+    @property
+    def last(self):
+        return self.files[-1].number
+
+    def path(self, number):
+        return self._by_number[number].path
+
+    def file_size(self, number):
+        return os.stat(self._by_number[number].path).st_size
+
+    def missing(self, start=None, end=None, stride=1):
+        start = self.first if start is None else start
+        end = self.last if end is None else min(end, self.last)
+        return [n for n in range(start, end + 1, max(1, stride)) if n not in self._by_number]
+
+
+class DirectoryIndex:
+    def __init__(self, directory, mtime_ns, files, sequences):
+        self.directory = directory
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.sequences = sequences
+
+    def find_file(self, hint=None, default_name=None, extensions=SUPPORTED_EXTENSIONS):
+        name = os.path.basename(hint) if hint else ""
+        if name in self.files and is_supported(name, extensions):
+            return self.files[name]
+        if default_name in self.files:
+            return self.files[default_name]
+        matches = [f for f in self.files.values() if is_supported(f.name, extensions)]
+        if len(matches) == 1:
+            return matches[0]
+        return None
+
+    def find_sequence(self, hint=None, extensions=SUPPORTED_EXTENSIONS):
+        candidates = [s for s in self.sequences if s.base_extension in extensions]
+        if hint:
+            match = _NUMBERED.match(os.path.basename(hint))
+            if match:
+                for sequence in candidates:
+                    if (sequence.prefix == match.group("prefix")
+                            and sequence.extension == match.group("extension").lower()):
+                        return sequence
+        if not candidates:
+            return None
+        return max(candidates, key=lambda s: (len(s), s.name))
+
+
+def scan_directory(directory, use_cache=True):
+    """Index ``directory`` with a single ``os.scandir`` pass.
+
+    Only names are read: files with a supported extension (optionally
+    ``.gz``/``.bz2``/``.xz`` compressed) are recorded, and files sharing a
+    prefix and extension around a frame number are grouped into sequences. No
+    file is stat'ed here; ``SequenceIndex.file_size`` stats a single frame on
+    demand, so planning an import only touches the frames it will load.
+
+    The result is cached until the directory's own mtime changes, so
+    re-planning an import costs one ``stat`` call. That mtime only changes when
+    files are added, removed or renamed, which is all the cached listing
+    depends on; network file systems may report it late, so pass
+    ``use_cache=False`` to force a fresh scan.
+    """
+    directory = os.path.abspath(directory)
+    mtime_ns = os.stat(directory).st_mtime_ns
+    cached = _cache.get(directory)
+    if use_cache and cached is not None and cached.mtime_ns == mtime_ns:
+        return cached
+
+    files = {}
+    grouped = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not is_supported(entry.name) or not entry.is_file():
+                continue
+            files[entry.name] = IndexedFile(entry.name, entry.path)
+
+            match = _NUMBERED.match(entry.name)
+            if match:
+                key = (match.group("prefix"), match.group("extension").lower())
+                grouped.setdefault(key, []).append(
+                    SequenceFile(int(match.group("number")), entry.path))
+
+    sequences = [SequenceIndex(directory, prefix, extension, sequence_files)
+                 for (prefix, extension), sequence_files in grouped.items()]
+    index = DirectoryIndex(directory, mtime_ns, files, sequences)
+    _cache[directory] = index
+    return index
+
+
+def find_sequence(directory, hint=None, extensions=SUPPORTED_EXTENSIONS):
+    return scan_directory(directory).find_sequence(hint, extensions)
+
+
+@contextmanager
+def local_copy(path):
+    """Yield a path readable by importers that do not understand compressed files,
+    decompressing into a temporary file when needed."""
+    extension, compression = split_extension(path)
+    if compression is None and extension not in GZIP_ALIASES:
+        yield path
+        return
+
+    if compression is None:
+        opener = gzip.open
+        extension = GZIP_ALIASES[extension]
+    else:
+        opener = COMPRESSION_OPENERS[compression]
+        extension = GZIP_ALIASES.get(extension, extension)
+
+    fd, temp_path = tempfile.mkstemp(suffix=extension)
+    try:
+        with opener(path, "rb") as source, os.fdopen(fd, "wb") as target:
+            shutil.copyfileobj(source, target, 1 << 20)
+        yield temp_path
+    finally:
+        os.remove(temp_path)
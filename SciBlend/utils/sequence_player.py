@@ -0,0 +1,134 @@
+import bisect
+import logging
+import os
+
+import bpy
+
+from .frame_container import FrameReader, FrameContainerError, interpolate_frames
+from .frame_sequence import FrameSequence, StreamedSequence
+from .mesh_data import replace_mesh_frame, update_mesh_frame
+from .sequence_handlers import FRAMES_PROP
+
+logger = logging.getLogger(__name__)
+
+SOURCE_PROP = "sciblend_source"
+NUMBERS_PROP = "sciblend_numbers"
+INTERVAL_PROP = "sciblend_keyframe_interval"
+INTERPOLATE_PROP = "sciblend_interpolate"
+STREAM_PROP = "sciblend_streamed"
+
+_players = {}
+
+
+class SequencePlayer:
+    def __init__(self, sequence, frames, numbers, interpolate=False, displayed=None):
+        self.sequence = sequence
+        self.frames = list(frames)
+        self.numbers = list(numbers)
+        self.interpolate = interpolate
+        self.displayed = displayed
+        self.segment = None if displayed is None else sequence.keyframe_of(displayed[0])
+        self._blendable = {}
+
+    def sample_at(self, scene_frame):
+        i = bisect.bisect_right(self.frames, scene_frame) - 1
+        if i < 0:
+            return (self.numbers[0], None, 0.0)
+        if not self.interpolate or i + 1 >= len(self.frames) or self.frames[i] == scene_frame:
+            return (self.numbers[i], None, 0.0)
+
+        number, next_number = self.numbers[i], self.numbers[i + 1]
+        if number not in self._blendable:
+            self._blendable[number] = self.sequence.same_topology(number, next_number)
+        if not self._blendable[number]:
+            return (number, None, 0.0)
+        t = (scene_frame - self.frames[i]) / (self.frames[i + 1] - self.frames[i])
+        return (number, next_number, t)
+
+
+def _stored_source(path):
+    """Path relative to the .blend file when the source lies under its folder,
+    so the file keeps working when moved together with its caches."""
+    blend_dir = os.path.dirname(bpy.data.filepath)
+    if not blend_dir:
+        return path
+    path = os.path.abspath(path)
+    try:
+        if os.path.commonpath([path, os.path.abspath(blend_dir)]) == os.path.abspath(blend_dir):
+            return bpy.path.relpath(path)
+    except ValueError:
+        pass
+    return path
+
+
+def attach_sequence(obj, sequence, frames, numbers, source=None, interpolate=False):
+    obj[FRAMES_PROP] = list(frames)
+    obj[NUMBERS_PROP] = list(numbers)
+    obj[INTERVAL_PROP] = sequence.keyframe_interval
+    obj[INTERPOLATE_PROP] = interpolate
+    obj[STREAM_PROP] = isinstance(sequence, StreamedSequence)
+    if source:
+        obj[SOURCE_PROP] = _stored_source(source)
+    _players[obj.name_full] = SequencePlayer(sequence, frames, numbers, interpolate,
+                                             displayed=(numbers[0], None, 0.0))
+
+
+def _player_for(obj):
+    if obj.name_full in _players:
+        return _players[obj.name_full]
+
+    player = None
+    source = obj.get(SOURCE_PROP)
+    if source:
+        numbers = list(obj[NUMBERS_PROP])
+        path = bpy.path.abspath(source)
+        try:
+            if obj.get(STREAM_PROP, False):
+                sequence = StreamedSequence(path, numbers, obj.get(INTERVAL_PROP, 1))
+            else:
+                with FrameReader(path) as reader:
+                    sequence = FrameSequence.from_reader(reader, numbers, obj.get(INTERVAL_PROP, 10))
+            player = SequencePlayer(sequence, obj[FRAMES_PROP], numbers,
+                                    bool(obj.get(INTERPOLATE_PROP, False)))
+        except (OSError, KeyError, FrameContainerError) as e:
+            logger.warning(f"Could not reload frame sequence for {obj.name} from {source}: {e}")
+
+    _players[obj.name_full] = player
+    return player
+
+
+def show_frame(obj, scene_frame):
+    player = _player_for(obj)
+    if player is None:
+        return
+
+    sample = player.sample_at(scene_frame)
+    if sample == player.displayed:
+        return
+
+    sequence = player.sequence
+    number, next_number, t = sample
+    frame_data = sequence.frame(number)
+    if next_number is not None:
+        frame_data = interpolate_frames(frame_data, sequence.frame(next_number), t)
+
+    segment = sequence.keyframe_of(number)
+    if segment == player.segment:
+        update_mesh_frame(obj.data, frame_data)
+    else:
+        replace_mesh_frame(obj.data, frame_data)
+    player.displayed = sample
+    player.segment = segment
+
+
+def release_player(obj):
+    player = _players.pop(obj.name_full, None)
+    if player is not None and isinstance(player.sequence, StreamedSequence):
+        player.sequence.close()
+
+
+def clear_players():
+    for player in _players.values():
+        if player is not None and isinstance(player.sequence, StreamedSequence):
+            player.sequence.close()
+    _players.clear()
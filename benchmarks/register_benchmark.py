@@ -0,0 +1,53 @@
+"""Startup benchmark for the SciBlend addon.
+
+Imports the addon once and registers/unregisters it repeatedly, failing if the
+import plus the slowest registration exceeds the budget. Run it with Blender:
+
+    blender --background --factory-startup --python-exit-code 1 \
+        --python benchmarks/register_benchmark.py -- [runs] [budget_ms]
+"""
+
+import importlib
+import os
+import sys
+import time
+
+DEFAULT_RUNS = 20
+DEFAULT_BUDGET_MS = 100.0
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv):
+    args = argv[argv.index("--") + 1:] if "--" in argv else []
+    runs = int(args[0]) if len(args) > 0 else DEFAULT_RUNS
+    budget_ms = float(args[1]) if len(args) > 1 else DEFAULT_BUDGET_MS
+    return runs, budget_ms
+
+
+def main():
+    runs, budget_ms = parse_args(sys.argv)
+    sys.path.insert(0, REPO_DIR)
+
+    started = time.perf_counter()
+    addon = importlib.import_module("SciBlend")
+    import_ms = (time.perf_counter() - started) * 1000
+
+    register_ms = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        addon.register()
+        register_ms.append((time.perf_counter() - started) * 1000)
+        addon.unregister()
+
+    slowest = max(register_ms)
+    print(f"import: {import_ms:.1f} ms")
+    print(f"register: min {min(register_ms):.1f} ms, max {slowest:.1f} ms over {runs} runs")
+
+    assert import_ms + slowest <= budget_ms, (
+        f"SciBlend took {import_ms + slowest:.1f} ms to import and register, "
+        f"over the {budget_ms:.0f} ms budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Round-trip checks between the ParaView export macro and the Blender-side
+reader, which implement the .sbf container independently."""
+
+import ast
+import importlib.util
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MACRO_PATH = os.path.join(REPO_DIR, "Paraview Macros", "export_animation_compressed.py")
+CONTAINER_PATH = os.path.join(REPO_DIR, "SciBlend", "utils", "frame_container.py")
+GUI_MODULES = ("paraview", "vtkmodules", "tkinter")
+
+
+def load_container():
+    # Loaded by path: importing the SciBlend package would require bpy.
+    spec = importlib.util.spec_from_file_location("frame_container", CONTAINER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_macro():
+    """Constants and functions of the macro, without the ParaView imports and the
+    dialog-driven script that runs at module level."""
+    with open(MACRO_PATH) as f:
+        tree = ast.parse(f.read(), MACRO_PATH)
+
+    def keep(node):
+        if isinstance(node, ast.FunctionDef):
+            return True
+        if isinstance(node, ast.Assign):
+            return all(isinstance(t, ast.Name) and t.id.isupper() for t in node.targets)
+        if isinstance(node, ast.Import):
+            return not any(alias.name.startswith(GUI_MODULES) for alias in node.names)
+        if isinstance(node, ast.ImportFrom):
+            return not node.module.startswith(GUI_MODULES)
+        return False
+
+    namespace = {}
+    module = ast.Module(body=[node for node in tree.body if keep(node)], type_ignores=[])
+    exec(compile(module, MACRO_PATH, "exec"), namespace)
+    return namespace
+
+
+def make_frames(count, vertices=50, with_colors=True, with_scalars=True):
+    rng = np.random.default_rng(0)
+    base = rng.random((vertices, 3), dtype=np.float32) * 10
+    indices = rng.integers(0, vertices, size=(vertices - 2) * 3).astype(np.int64)
+    frames = []
+    for number in range(1, count + 1):
+        positions = base + np.float32(0.1 * number)
+        colors = np.full((vertices, 3), number * 10, dtype=np.uint8) if with_colors else None
+        scalars = np.linspace(0, number, vertices, dtype=np.float32) if with_scalars else None
+        frames.append((number, positions, indices, colors, scalars))
+    return frames
+
+
+@pytest.fixture(scope="module")
+def container():
+    return load_container()
+
+
+@pytest.fixture(scope="module")
+def macro():
+    return load_macro()
+
+
+def test_layout_constants_match(container, macro):
+    assert macro["MAGIC"] == container.MAGIC
+    assert macro["VERSION"] == container.VERSION
+    assert macro["HEADER"].format == container._HEADER.format
+    assert macro["FRAME"].format == container._FRAME.format
+    assert macro["CHUNK"].format == container._CHUNK.format
+    assert macro["INDEX_ENTRY"].format == container._INDEX_ENTRY.format
+    assert macro["DTYPES"] == container._DTYPES
+
+
+@pytest.mark.parametrize("codec", ["CODEC_ZLIB", "CODEC_LZMA"])
+@pytest.mark.parametrize("keyframe_interval", [1, 4])
+def test_macro_file_reads_back(container, macro, tmp_path, codec, keyframe_interval):
+    frames = make_frames(9)
+    path = str(tmp_path / "frames.sbf")
+    macro["write_frames"](path, iter(frames), macro[codec], keyframe_interval)
+
+    with container.FrameReader(path) as reader:
+        assert reader.frame_numbers == [f[0] for f in frames]
+        for number, positions, indices, colors, scalars in frames:
+            frame = reader.read_frame(number)
+            extent = positions.max(axis=0) - positions.min(axis=0)
+            assert np.all(np.abs(frame.positions - positions) <= extent / 65535 * 2 + 1e-5)
+            assert frame.indices.dtype == np.int32
+            np.testing.assert_array_equal(frame.indices, indices)
+            np.testing.assert_array_equal(frame.colors, colors)
+            np.testing.assert_allclose(frame.scalars, scalars, atol=1e-5)
+
+
+def test_macro_writes_deltas(container, macro, tmp_path):
+    path = str(tmp_path / "frames.sbf")
+    macro["write_frames"](path, iter(make_frames(6)), macro["CODEC_ZLIB"], 3)
+
+    with container.FrameReader(path) as reader:
+        keyed = [reader.read_keyed_frame(n)[0] for n in reader.frame_numbers]
+    assert keyed == [1, 1, 1, 4, 4, 4]
+
+
+def test_macro_and_writer_chunks_match(container, macro):
+    _, positions, indices, colors, scalars = make_frames(1)[0]
+    ours = container.encode_frame(positions, indices, colors, scalars)
+    theirs = macro["encode_frame"](positions, indices, colors, scalars)
+    assert ours.keys() == theirs.keys()
+    for tag in ours:
+        np.testing.assert_array_equal(np.asarray(ours[tag]).ravel(), np.asarray(theirs[tag]).ravel())
+
+
+def test_interrupted_export_stays_readable(container, macro, tmp_path):
+    def failing_frames():
+        yield from make_frames(3)
+        raise IndexError("no more timesteps")
+
+    path = str(tmp_path / "frames.sbf")
+    with pytest.raises(IndexError):
+        macro["write_frames"](path, failing_frames(), macro["CODEC_ZLIB"], 2)
+
+    with container.FrameReader(path) as reader:
+        assert reader.frame_numbers == [1, 2, 3]
+        assert reader.read_frame(3).positions.shape == (50, 3)
+
+
+def test_merge_frames_offsets_indices(macro):
+    a = make_frames(1, vertices=4)[0][1:]
+    b = make_frames(1, vertices=5, with_colors=False)[0][1:]
+    positions, indices, colors, scalars = macro["merge_frames"]([a, b])
+    assert len(positions) == 9
+    np.testing.assert_array_equal(indices[len(a[1]):], b[1] + 4)
+    np.testing.assert_array_equal(colors[4:], 255)
+    assert len(scalars) == 9